@@ -2,6 +2,7 @@ from pathlib import Path
 import pandas as pd  # type: ignore
 from docx import Document
 from docx.document import Document as DocxDocument
+from docx.oxml.ns import nsmap
 from docx.table import Table as DocxTable
 import re
 from typing import Dict, Any, Optional, List, Union, Set, Tuple
@@ -11,6 +12,7 @@ import time
 import gc
 from functools import lru_cache
 import logging
+from lxml import etree
 
 # 创建控制台对象用于美化输出
 console = Console()
@@ -19,6 +21,9 @@ console = Console()
 BATCH_NUMBER_PATTERN = re.compile(r"第([一二三四五六七八九十百零\d]+)批")
 WHITESPACE_PATTERN = re.compile(r"\s+")
 
+# 预编译的单元格文本XPath, 避免每个单元格重新解析表达式
+CELL_TEXT_XPATH = etree.XPath(".//w:t/text()", namespaces=nsmap)
+
 # 中文数字映射表
 CN_NUMS = {
     "零": "0",
@@ -217,7 +222,7 @@ class DocProcessor:
             cells = []
             for cell in row.tc_lst:
                 # 提取并清理文本
-                text = "".join(node.text for node in cell.xpath(".//w:t"))
+                text = "".join(CELL_TEXT_XPATH(cell))
                 text = self._clean_text(text)
                 cells.append(text)
 
@@ -2,8 +2,22 @@ from pathlib import Path
 import pandas as pd  # type: ignore
 from docx import Document  # type: ignore
 from docx.document import Document as DocxDocument  # type: ignore
+from docx.oxml.ns import nsmap, qn  # type: ignore
+from docx.table import Table as DocxTable  # type: ignore
+from docx.text.paragraph import Paragraph  # type: ignore
 import re
-from typing import Dict, Any, Optional, List, Set, Tuple, Callable, Union
+from typing import (
+    Dict,
+    Any,
+    Optional,
+    List,
+    Set,
+    Tuple,
+    Callable,
+    Union,
+    Iterable,
+    Iterator,
+)
 import click  # type: ignore
 from rich.console import Console
 from rich.table import Table
@@ -15,10 +29,12 @@ from rich.progress import (
     TimeRemainingColumn,
     TimeElapsedColumn,
 )
-from rich.text import Text
+from rich.markup import escape
+from rich.style import Style
 from rich.tree import Tree
 import textwrap
 from functools import lru_cache, partial
+from itertools import islice, zip_longest
 import cProfile
 import pstats
 from io import StringIO
@@ -28,22 +44,56 @@ import os
 import gc
 import logging
 import multiprocessing as mp
-import tempfile
-import shutil
+import heapq
+import csv
 import yaml  # type: ignore
+from lxml import etree  # type: ignore
 import logging.config
 from datetime import datetime
 from dataclasses import dataclass, field
+from collections import Counter, defaultdict
+
+# 优先使用基于libyaml的C加载器, 不可用时回退到纯Python实现
+try:
+    from yaml import CSafeLoader as YamlLoader  # type: ignore
+except ImportError:
+    from yaml import SafeLoader as YamlLoader  # type: ignore
 
 
-# 创建控制台对象
-console = Console()
+# 创建控制台对象, 输出均已使用显式标记, 关闭自动高亮以省去逐行的正则扫描
+console = Console(highlight=False)
 
 
 # 预编译正则表达式
-BATCH_NUMBER_PATTERN = re.compile(r"第([一二三四五六七八九十百零\d]+)批")
+# 批次标题中的数字两侧允许有空格, 如"第 65 批"
+BATCH_NUMBER_PATTERN = re.compile(r"第\s*([一二三四五六七八九十百零\d]+)\s*批")
+BATCH_TRIGGER_PATTERN = re.compile(r"[一二三四五六七八九十百零\d]+\s*批")
 WHITESPACE_PATTERN = re.compile(r"\s+")
 CHINESE_NUMBER_PATTERN = re.compile(r"([一二三四五六七八九十百零]+)")
+# 与str.isdigit一致的数字字符类, 除\d外还包括上标、下标和带圈数字等, 如"m³"中的"³"
+DIGIT_CLASS = (
+    r"[\d\u00b2\u00b3\u00b9\u1369-\u1371\u19da\u2070\u2074-\u2079\u2080-\u2089"
+    r"\u2460-\u2468\u2474-\u247c\u2488-\u2490\u24ea\u24f5-\u24fd\u24ff"
+    r"\u2776-\u277e\u2780-\u2788\u278a-\u2792\U00010a40-\U00010a43"
+    r"\U00010e60-\U00010e68\U00011052-\U0001105a\U0001f100-\U0001f10a]"
+)
+DIGIT_PATTERN = re.compile(DIGIT_CLASS)
+# clean_text的字符转换表: 各类空白字符统一为空格, 全角标点转为半角
+# Unicode空白字符(与正则\s一致)均不超过U+3000
+CLEAN_TEXT_TABLE = str.maketrans(
+    {
+        **{chr(c): " " for c in range(0x3001) if chr(c).isspace() and c != 0x20},
+        "，": ",",
+        "；": ";",
+    }
+)
+# 连续空格, 转换后一次合并
+MULTI_SPACE_PATTERN = re.compile(r" {2,}")
+# 需要规整的空白: 非空格的空白字符或连续空格, 单个空格无需处理
+IRREGULAR_WHITESPACE_PATTERN = re.compile(r"[^\S ]| {2}")
+# 总记录数模式
+COUNT_PATTERN = re.compile(r"(共计|总计|合计).*?(\d+).*?(款|个|种|辆|台|项)")
+COUNT_TRIGGER_PATTERN = re.compile(r"[总共]|合计")
 
 # 中文数字映射表
 CN_NUMS = {
@@ -61,6 +111,113 @@ CN_NUMS = {
     "百": "100",
 }
 
+# 额外信息的标识词和对应类型(按优先级排列)
+INFO_TYPES: Dict[str, str] = {
+    "勘误": "勘误",
+    "关于": "政策",
+    "符合": "说明",
+    "技术要求": "说明",
+    "自动转入": "说明",
+    "第二部分": "说明",
+}
+# 一次扫描找出段落中出现的所有标识词
+INFO_MARKER_PATTERN = re.compile("|".join(map(re.escape, INFO_TYPES)))
+
+# 需要合并的型号字段(按优先级排列)
+MODEL_FIELDS = ("产品型号", "车辆型号", "型号")
+
+# 需要转换为数值的字段
+NUMERIC_FIELDS = ("排量(ml)", "整车整备质量(kg)", "综合燃料消耗量（L/100km）")
+
+# 车辆表格必须包含的表头列
+REQUIRED_TABLE_COLUMNS = frozenset({"序号", "企业名称"})
+
+# 有效记录必须包含的字段
+REQUIRED_FIELDS = ("energytype", "category", "sub_type")
+
+# 字段名称标准化映射
+FIELD_MAPPING: Dict[str, str] = {
+    "通用名称": "品牌",
+    "商标": "品牌",
+    "生产企业": "企业名称",
+    "企业": "企业名称",
+}
+
+# 文档预览的段落分类模式, 分支顺序即判断优先级
+PREVIEW_CLASS_PATTERN = re.compile(
+    r"(?P<batch>(?=.*批))"
+    r"|(?P<category>(?=.*(?:节能型汽车|新能源汽车)))"
+    r"|(?P<subsection>（(?!.*" + DIGIT_CLASS + "))"
+    r"|(?P<info>(?=.*(?:勘误|关于|符合|技术要求|自动转入)))",
+    re.S,
+)
+# 文档预览中各类段落的样式和图标
+PREVIEW_STYLES: Dict[str, Tuple[str, str]] = {
+    "batch": ("bold red", "🔖"),
+    "category": ("bold green", "📌"),
+    "subsection": ("bold yellow", "📎"),
+    "info": ("bold magenta", "ℹ️"),
+}
+
+# 文档预览最多显示的段落数和表格数
+PREVIEW_MAX_PARAGRAPHS = 2000
+PREVIEW_MAX_TABLES = 100
+# 批次数超过该值且输出不是终端时, 批次汇总改为纯文本输出
+PLAIN_BATCH_SUMMARY_THRESHOLD = 500
+
+# 复用的文本换行器, 避免每次显示时重新创建TextWrapper
+TEXT_WRAPPER = textwrap.TextWrapper(width=100)
+TEXT_SHORTENER = textwrap.TextWrapper(width=100, max_lines=1, placeholder=" [...]")
+
+# 文档结构树中各类节点的样式和图标
+NODE_STYLES: Dict[str, Tuple[str, str]] = {
+    "root": ("bold blue", "📑"),
+    "section": ("bold cyan", "📌"),
+    "subsection": ("bold yellow", "📎"),
+    "numbered_section": ("bold green", "🔢"),
+    "numbered_subsection": ("bold magenta", "📍"),
+    "table": ("bold blue", "📊"),
+    "text": ("white", "📝"),
+    "note": ("bold magenta", "ℹ️"),
+    "correction": ("bold red", "⚠️"),
+}
+DEFAULT_NODE_STYLE = ("white", "•")
+
+# 报告表格的公共样式, 导入时解析一次, 各处Table(**TABLE_STYLE)复用
+TABLE_STYLE: Dict[str, Any] = {
+    "title_style": Style.parse("bold cyan"),
+    "show_header": True,
+    "header_style": Style.parse("bold green"),
+    "border_style": Style.parse("blue"),
+}
+
+# 段落分类模式, 分支顺序即判断优先级, 通过match.lastgroup取得类别
+PARAGRAPH_CLASS_PATTERN = re.compile(
+    r"(?P<energy_saving>(?=.*节能型汽车))"
+    r"|(?P<new_energy>(?=.*新能源汽车))"
+    r"|(?P<subsection>（(?!.*" + DIGIT_CLASS + "))"
+    r"|(?P<numbered_section>[1-5]\.)"
+    r"|(?P<numbered_subsection>（(?=.*[1-9]))"
+    r"|(?P<note>(?=.*(?:勘误|说明)))"
+    r"|(?P<correction>(?=.*(?:更正|修改)))",
+    re.S,
+)
+# 分类段落类别对应的节点标题和分类名称
+SECTION_CATEGORIES: Dict[str, Tuple[str, str]] = {
+    "energy_saving": ("节能型汽车", "节能型"),
+    "new_energy": ("新能源汽车", "新能源"),
+}
+
+# 预编译的表格XPath, 单元格文本一次取回所有w:t文本节点
+TABLE_ROW_XPATH = etree.XPath(".//w:tr", namespaces=nsmap)
+TABLE_CELL_XPATH = etree.XPath(".//w:tc", namespaces=nsmap)
+CELL_TEXT_XPATH = etree.XPath(".//w:t/text()", namespaces=nsmap)
+# 正文中的顶层段落和表格, 按文档顺序一次取出
+BODY_BLOCK_XPATH = etree.XPath("./w:p | ./w:tbl", namespaces=nsmap)
+# 段落和表格元素的完整标签名, 用于按标签直接比较分派
+PARAGRAPH_TAG = qn("w:p")
+TABLE_TAG = qn("w:tbl")
+
 
 @lru_cache(maxsize=1024)
 def cn_to_arabic(cn_num: str) -> str:
@@ -103,6 +260,14 @@ def cn_to_arabic(cn_num: str) -> str:
     return CN_NUMS.get(cn_num, cn_num)
 
 
+def batch_sort_key(batch: str) -> Tuple[int, int, str]:
+    """
+    批次排序键, 数字批次按数值排序("9"在"10"之前), 其他批次排在最后
+    """
+    # isdecimal只接受可被int解析的十进制数字, 排除"²"等上标字符
+    return (0, int(batch), batch) if batch.isdecimal() else (1, 0, batch)
+
+
 @lru_cache(maxsize=1024)
 def extract_batch_number(text: str) -> Optional[str]:
     """
@@ -122,29 +287,48 @@ def extract_batch_number(text: str) -> Optional[str]:
         except (KeyError, ValueError):
             return None
 
-    # 如果没有找到批次号格式, 尝试直接转换纯中文数字
-    if any(char in text for char in "一二三四五六七八九十百零"):
+    # 如果没有找到批次号格式, 尝试提取连续的中文数字直接转换
+    match = CHINESE_NUMBER_PATTERN.search(text)
+    if match:
         try:
-            # 提取连续的中文数字
-            match = CHINESE_NUMBER_PATTERN.search(text)
-            if match:
-                return cn_to_arabic(match.group(1))
+            return cn_to_arabic(match.group(1))
         except (KeyError, ValueError):
             pass
 
     return None
 
 
-@lru_cache(maxsize=1024)
+@lru_cache(maxsize=1 << 16)
 def clean_text(text: str) -> str:
     """
     清理文本内容, 使用缓存提高性能
+    表格单元格重复值很多(企业名称、变速器型式等), 缓存容量按单元格量级设置
     """
-    # 移除多余的空白字符
-    text = WHITESPACE_PATTERN.sub(" ", text.strip())
-    # 统一全角字符到半角
-    text = text.replace(", ", ",").replace("；", ";")
-    return text
+    text = text.strip()
+    # 大多数单元格已是规整文本, 无需替换时直接返回
+    if (
+        "，" not in text
+        and "；" not in text
+        and IRREGULAR_WHITESPACE_PATTERN.search(text) is None
+    ):
+        return text
+    # 一次translate统一空白和全角标点, 再合并连续空格
+    return MULTI_SPACE_PATTERN.sub(" ", text.translate(CLEAN_TEXT_TABLE))
+
+
+@lru_cache(maxsize=4096)
+def wrap_text(text: str) -> Tuple[str, ...]:
+    """
+    按显示宽度换行, 缓存重复出现的标题和内容
+    """
+    return tuple(TEXT_WRAPPER.wrap(text))
+
+
+def shorten_text(text: str) -> str:
+    """
+    压缩空白并截断为单行, 与textwrap.shorten结果一致
+    """
+    return TEXT_SHORTENER.fill(" ".join(text.split()))
 
 
 def validate_car_info(
@@ -161,32 +345,33 @@ def validate_car_info(
     ):
         return False, "合计行", None
 
-    # 尝试修复数据
-    fixed_info = car_info.copy()
+    # 尝试修复数据, 首次需要修改时才复制, 无需修复的记录直接返回原字典
+    fixed_info = car_info
 
     # 1. 处理变速器信息
     if "型式" in fixed_info and "档位数" in fixed_info:
+        fixed_info = car_info.copy()
         fixed_info["变速器"] = f"{fixed_info.pop('型式')} {fixed_info.pop('档位数')}"
 
     # 2. 标准化数值字段
-    numeric_fields = ["排量(ml)", "整车整备质量(kg)", "综合燃料消耗量（L/100km）"]
-    for fields in numeric_fields:
-        if fields in fixed_info:
-            value = fixed_info[fields]
-            if isinstance(value, str):
-                # 处理多个数值的情况（如范围值）
-                if "/" in value:
-                    values = [float(v.strip()) for v in value.split("/") if v.strip()]
-                    fixed_info[fields] = min(values)  # 使用最小值
-                else:
-                    try:
-                        fixed_info[fields] = float(value.replace(", ", ","))
-                    except ValueError:
-                        logging.warning(f"无法转换数值: {fields}={value}")
+    for fields in NUMERIC_FIELDS:
+        value = fixed_info.get(fields)
+        if isinstance(value, str):
+            if fixed_info is car_info:
+                fixed_info = car_info.copy()
+            # 处理多个数值的情况（如范围值）, float自身会忽略首尾空白
+            if "/" in value:
+                fixed_info[fields] = min(  # 使用最小值
+                    float(v) for v in value.split("/") if v.strip()
+                )
+            else:
+                try:
+                    fixed_info[fields] = float(value)
+                except ValueError:
+                    logging.warning(f"无法转换数值: {fields}={value}")
 
     # 3. 确保必要字段存在
-    required_fields = ["energytype", "category", "sub_type"]
-    for fields in required_fields:
+    for fields in REQUIRED_FIELDS:
         if fields not in fixed_info:
             return False, f"缺少必要字段: {fields}", None
 
@@ -207,31 +392,23 @@ def get_table_type(
     Returns:
         (category, sub_type)元组
     """
-    # 标准化表头
-    normalized_headers = [h.strip().lower() for h in headers]
-
-    # 验证必要的列是否存在
-    required_columns = {"序号", "企业名称"}
-    missing_columns = required_columns - set(normalized_headers)
+    # 验证必要的列是否存在, 表头只用于校验, 分类完全由上下文决定
+    missing_columns = set(REQUIRED_TABLE_COLUMNS).difference(
+        h.strip().lower() for h in headers
+    )
     if missing_columns:
         raise ValueError(f"表格缺少必要的列: {missing_columns}")
 
-    # 处理特殊的表头组合
-    if "型式" in normalized_headers and "档位数" in normalized_headers:
-        # 合并为变速器列
-        idx = normalized_headers.index("型式")
-        normalized_headers[idx] = "变速器"
-        normalized_headers.pop(idx + 1)
-
     # 只从表头判断category（节能型或新能源）
     category = current_category or "未知"
+    category_text = str(current_category).lower()
 
     # 如果在明确的节能型部分中，优先使用节能型分类
-    if "节能型" in str(current_category).lower():
+    if "节能型" in category_text:
         category = "节能型"
 
     # 如果在明确的新能源部分中，优先使用新能源分类
-    if "新能源" in str(current_category).lower():
+    if "新能源" in category_text:
         category = "新能源"
 
     # 始终使用当前上下文的子类型，不从表头判断
@@ -258,28 +435,18 @@ def process_car_info(
     if batch_number:
         car_info["batch"] = batch_number
 
-    # 合并型号字段
-    model_fields = ["产品型号", "车辆型号", "型号"]
-    model_values = []
-    for fields in model_fields:
-        if fields in car_info:
-            value = car_info.pop(fields) if fields != "vmodel" else car_info.get(fields)
-            if value and str(value).strip():
-                model_values.append(clean_text(str(value)))
+    # 合并型号字段, 使用第一个非空的型号, 其余型号字段一并移除
+    vmodel = None
+    for model_field in MODEL_FIELDS:
+        value = car_info.pop(model_field, None)
+        if vmodel is None and value and str(value).strip():
+            vmodel = clean_text(str(value))
 
-    if model_values:
-        car_info["vmodel"] = model_values[0]  # 使用第一个非空的型号
-
-    # 标准化字段名称
-    field_mapping: Dict[str, str] = {
-        "通用名称": "品牌",
-        "商标": "品牌",
-        "生产企业": "企业名称",
-        "企业": "企业名称",
-    }
+    if vmodel is not None:
+        car_info["vmodel"] = vmodel
 
     # 处理字段映射
-    for old_field, new_field in field_mapping.items():
+    for old_field, new_field in FIELD_MAPPING.items():
         if old_field in car_info:
             value = car_info.pop(old_field)
             if value and str(value).strip():
@@ -293,6 +460,23 @@ def process_car_info(
     return car_info
 
 
+def process_car_infos(
+    car_infos: List[Dict[str, Any]], batch_number: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    批量处理一张表格的车辆信息
+
+    Args:
+        car_infos: 原始车辆信息字典列表
+        batch_number: 批次号
+
+    Returns:
+        处理后的车辆信息字典列表
+    """
+    process = process_car_info
+    return [process(car_info, batch_number) for car_info in car_infos]
+
+
 def extract_doc_content(doc_path: str) -> Tuple[List[str], List[Dict[str, str]]]:
     """
     提取文档中除表格外的内容, 并分离额外信息
@@ -300,20 +484,12 @@ def extract_doc_content(doc_path: str) -> Tuple[List[str], List[Dict[str, str]]]
     doc: DocxDocument = Document(doc_path)
     paragraphs: List[str] = []
     extra_info: List[Dict[str, str]] = []
+    # 按(类型, 章节)索引已保存的额外信息, 便于合并
+    info_index: Dict[Tuple[str, str], Dict[str, str]] = {}
     current_section: Optional[str] = None
     batch_found = False
     batch_number = None
 
-    # 额外信息的标识词和对应类型
-    info_types: Dict[str, str] = {
-        "勘误": "勘误",
-        "关于": "政策",
-        "符合": "说明",
-        "技术要求": "说明",
-        "自动转入": "说明",
-        "第二部分": "说明",
-    }
-
     # 用于收集连续的额外信息文本
     current_extra_info: Optional[Dict[str, str]] = None
 
@@ -321,31 +497,23 @@ def extract_doc_content(doc_path: str) -> Tuple[List[str], List[Dict[str, str]]]
         """保存当前的额外信息"""
         nonlocal current_extra_info
         if current_extra_info:
-            # 清理和规范化内容
-            content = current_extra_info["content"]
-            # 移除多余的空白字符
-            content = re.sub(r"\s+", " ", content)
-            # 移除换行符
-            content = content.replace("\n", " ")
-            current_extra_info["content"] = content.strip()
+            # 清理和规范化内容: 合并连续空白(含换行)并去除首尾空白
+            current_extra_info["content"] = " ".join(
+                current_extra_info["content"].split()
+            )
 
             # 添加批次号
             if batch_number:
                 current_extra_info["batch"] = batch_number
 
             # 检查是否需要合并相同类型和章节的信息
-            for info in extra_info:
-                if (
-                    info["type"] == current_extra_info["type"]
-                    and info["section"] == current_extra_info["section"]
-                ):
-                    info["content"] = (
-                        info["content"] + " " + current_extra_info["content"]
-                    )
-                    current_extra_info = None
-                    return
-
-            extra_info.append(current_extra_info)
+            key = (current_extra_info["type"], current_extra_info["section"])
+            info = info_index.get(key)
+            if info is not None:
+                info["content"] = info["content"] + " " + current_extra_info["content"]
+            else:
+                extra_info.append(current_extra_info)
+                info_index[key] = current_extra_info
             current_extra_info = None
 
     # 遍历文档段落
@@ -357,8 +525,8 @@ def extract_doc_content(doc_path: str) -> Tuple[List[str], List[Dict[str, str]]]
                 save_current_extra_info()
             continue
 
-        # 检查批次号
-        if not batch_found and "批" in text:
+        # 检查批次号, 找到后不再匹配
+        if not batch_found and BATCH_TRIGGER_PATTERN.search(text):
             extracted_batch = extract_batch_number(text)
             if extracted_batch:
                 batch_number = extracted_batch
@@ -372,18 +540,18 @@ def extract_doc_content(doc_path: str) -> Tuple[List[str], List[Dict[str, str]]]
             current_section = text
             paragraphs.append(text)
         # 识别子分类,排除括号中有数字的
-        elif text.startswith("（") and not any(str.isdigit() for str in text):
+        elif text.startswith("（") and not DIGIT_PATTERN.search(text):
             save_current_extra_info()
             current_section = text
             paragraphs.append(text)
         # 识别额外信息
-        elif any(marker in text for marker in info_types.keys()):
+        elif markers := set(INFO_MARKER_PATTERN.findall(text)):
             # 如果当前文本包含新的标识词, 保存之前的信息并创建新的
             if current_extra_info:
                 save_current_extra_info()
 
-            # 创建新的额外信息
-            info_type = next((t for m, t in info_types.items() if m in text), "其他")
+            # 创建新的额外信息, 多个标识词同时出现时按INFO_TYPES的顺序取类型
+            info_type = next(t for m, t in INFO_TYPES.items() if m in markers)
             current_extra_info = {
                 "section": current_section or "文档说明",
                 "type": info_type,
@@ -401,71 +569,152 @@ def extract_doc_content(doc_path: str) -> Tuple[List[str], List[Dict[str, str]]]
     return paragraphs, extra_info
 
 
+@dataclass(slots=True)
+class PreviewBlock:
+    """
+    文档预览中的一个块
+    block_type为paragraph、table, 或paragraphs_end、tables_end(各部分结束, 附带省略数量)
+    """
+
+    block_type: str
+    index: int = 0
+    text: str = ""
+    style_name: str = ""
+    category: Optional[str] = None  # 段落类别, 对应PREVIEW_STYLES的键
+    shape: Tuple[int, int] = (0, 0)  # 表格的(行数, 列数)
+    rows: List[List[str]] = field(default_factory=list)  # 表头及前5行数据
+    omitted: int = 0
+
+
+def iter_docx_preview(doc: DocxDocument) -> Iterator[PreviewBlock]:
+    """
+    按预览上限依次产生段落和表格块, 供Rich和纯文本两种输出共用
+    段落和表格都按需包装, 超过上限的部分只计数
+    """
+    paragraphs = doc.element.body.iterchildren(PARAGRAPH_TAG)
+    for i, p in enumerate(islice(paragraphs, PREVIEW_MAX_PARAGRAPHS), 1):
+        para = Paragraph(p, doc)
+        text = para.text.strip()
+        if text:
+            # 一次匹配得到段落类别, 未匹配时类别为None
+            match = PREVIEW_CLASS_PATTERN.match(text)
+            yield PreviewBlock(
+                "paragraph",
+                index=i,
+                text=text,
+                style_name=para.style.name if para.style else "默认样式",
+                category=match.lastgroup if match else None,
+            )
+    yield PreviewBlock("paragraphs_end", omitted=sum(1 for _ in paragraphs))
+
+    tables = doc.element.body.iterchildren(TABLE_TAG)
+    for i, tbl in enumerate(islice(tables, PREVIEW_MAX_TABLES), 1):
+        # 行只取一次, table.rows每次访问都会重新包装所有行
+        rows = list(DocxTable(tbl, doc).rows)
+        if rows:
+            yield PreviewBlock(
+                "table",
+                index=i,
+                shape=(len(rows), len(rows[0].cells)),
+                rows=[[cell.text.strip() for cell in row.cells] for row in rows[:6]],
+            )
+    yield PreviewBlock("tables_end", omitted=sum(1 for _ in tables))
+
+
+def format_docx_content_plain(doc: DocxDocument, doc_path: str) -> str:
+    """将文档内容预览格式化为缩进的纯文本"""
+    lines = [
+        f"文件详细内容: {doc_path}",
+        f"📄 {Path(doc_path).name}",
+        "📝 段落内容",
+    ]
+
+    for block in iter_docx_preview(doc):
+        if block.block_type == "paragraph":
+            kind = block.category
+            icon = PREVIEW_STYLES[kind][1] + " " if kind else ""
+            # 多行段落的后续行同样缩进, 保持在段落标题之下
+            text = block.text
+            body = text.replace("\n", "\n    ") if kind else shorten_text(text)
+            lines.append(f"  段落 {block.index} ({block.style_name}): {icon}{body}")
+        elif block.block_type == "table":
+            n_rows, n_cols = block.shape
+            lines.append(f"  表格 {block.index} ({n_rows}行 x {n_cols}列)")
+            lines += ["    " + " | ".join(cells) for cells in block.rows if any(cells)]
+        elif block.block_type == "paragraphs_end":
+            if block.omitted:
+                lines.append(f"  ... 其余 {block.omitted} 个段落已省略 ...")
+            lines.append("📊 表格内容")
+        elif block.omitted:
+            lines.append(f"  ... 其余 {block.omitted} 个表格已省略 ...")
+    return "\n".join(lines)
+
+
 def print_docx_content(doc_path: str) -> None:
     """打印文档内容预览, 显示所有元素的详细信息"""
     try:
         doc: DocxDocument = Document(doc_path)
+
+        # 输出不是终端时(重定向到文件或日志)只输出纯文本, 跳过Rich树和表格的构建
+        if not console.is_terminal:
+            console.out(format_docx_content_plain(doc, doc_path))
+            return
+
         console.print(
             Panel(
-                f"[bold cyan]文件详细内容: {doc_path}[/bold cyan]", border_style="cyan"
+                f"[bold cyan]文件详细内容: {doc_path}[/bold cyan]",
+                border_style="cyan",
             )
         )
 
-        # 创建一个树形结构
+        # 创建一个树形结构, 段落和表格两个部分
         tree = Tree(f"📄 {Path(doc_path).name}", style="bold blue")
-
-        # 添加段落内容
         paragraphs_node = tree.add("[bold magenta]📝 段落内容[/bold magenta]")
-        for i, para in enumerate(doc.paragraphs, 1):
-            text = para.text.strip()
-            if text:
-                style_name = para.style.name if para.style else "默认样式"
-                para_node = paragraphs_node.add(
-                    f"[blue]段落 {i}[/blue] ([yellow]{style_name}[/yellow])"
-                )
-                if "批" in text:
-                    para_node.add(f"🔖 [bold red]{text}[/bold red]")
-                elif "节能型汽车" in text or "新能源汽车" in text:
-                    para_node.add(f"📌 [bold green]{text}[/bold green]")
-                elif text.startswith("（") and not any(str.isdigit() for str in text):
-                    para_node.add(f"📎 [bold yellow]{text}[/bold yellow]")
-                elif any(
-                    marker in text
-                    for marker in ["勘误", "关于", "符合", "技术要求", "自动转入"]
-                ):
-                    para_node.add(f"ℹ️ [bold magenta]{text}[/bold magenta]")
-                else:
-                    para_node.add(Text(textwrap.shorten(text, width=100)))
-
-        # 添加表格内容
         tables_node = tree.add("[bold cyan]📊 表格内容[/bold cyan]")
-        for i, table in enumerate(doc.tables, 1):
-            if table.rows:
+
+        for block in iter_docx_preview(doc):
+            if block.block_type == "paragraph":
+                kind = block.category
+                body: str
+                if kind:
+                    style, icon = PREVIEW_STYLES[kind]
+                    body = f"{icon} [{style}]{block.text}[/{style}]"
+                else:
+                    body = escape(shorten_text(block.text))
+                # 段落标题和内容合并为一个多行节点, 每个段落只添加一次
+                paragraphs_node.add(
+                    f"[blue]段落 {block.index}[/blue] "
+                    f"([yellow]{block.style_name}[/yellow])\n{body}"
+                )
+            elif block.block_type == "table":
+                n_rows, n_cols = block.shape
                 table_node = tables_node.add(
-                    f"[blue]表格 {i}[/blue] ({len(table.rows)}行 x {len(table.rows[0].cells)}列)"
+                    f"[blue]表格 {block.index}[/blue] ({n_rows}行 x {n_cols}列)"
                 )
 
                 # 创建表格预览
                 preview_table = Table(
-                    show_header=True,
-                    header_style="bold green",
-                    border_style="blue",
-                    title=f"表格 {i} 预览",
-                    title_style="bold cyan",
+                    title=f"表格 {block.index} 预览",
+                    **TABLE_STYLE,
                 )
 
                 # 添加表头
-                headers = [cell.text.strip() for cell in table.rows[0].cells]
-                for header in headers:
+                for header in block.rows[0]:
                     preview_table.add_column(header, overflow="fold")
 
-                # 添加数据行预览
-                for row_idx, row in enumerate(table.rows[1:6], 1):  # 只显示前5行数据
-                    cells = [cell.text.strip() for cell in row.cells]
-                    if any(cells):  # 跳过空行
+                # 添加数据行预览, 跳过空行
+                for cells in block.rows[1:]:
+                    if any(cells):
                         preview_table.add_row(*cells)
 
                 table_node.add(preview_table)
+            elif block.omitted:
+                # 各部分结束时提示超过预览上限而省略的数量
+                if block.block_type == "paragraphs_end":
+                    node, label = paragraphs_node, "段落"
+                else:
+                    node, label = tables_node, "表格"
+                node.add(f"[dim]... 其余 {block.omitted} 个{label}已省略 ...[/dim]")
 
         console.print(tree)
 
@@ -482,17 +731,10 @@ def display_statistics(
     total_count: int, energy_saving_count: int, new_energy_count: int, output_file: str
 ) -> None:
     """Display processing statistics in a formatted table."""
-    # 在显示表格前添加标题, 表明这是关键信息
-    console.print()
-    console.print("[bold cyan]📊 关键信息：处理统计报告[/bold cyan]")
-
     # 创建统计表格
     stats_table = Table(
         title="📊 处理统计报告",
-        title_style="bold cyan",
-        show_header=True,
-        header_style="bold green",
-        border_style="blue",
+        **TABLE_STYLE,
     )
 
     # 添加列
@@ -501,10 +743,9 @@ def display_statistics(
     stats_table.add_column("占比", justify="right", style="yellow")
 
     # 计算百分比
-    energy_saving_percent = (
-        energy_saving_count / total_count * 100 if total_count > 0 else 0
-    )
-    new_energy_percent = new_energy_count / total_count * 100 if total_count > 0 else 0
+    scale = 100.0 / total_count if total_count > 0 else 0.0
+    energy_saving_percent = energy_saving_count * scale
+    new_energy_percent = new_energy_count * scale
 
     # 添加行
     stats_table.add_row("📝 总记录数", f"{total_count:,}", "100%")
@@ -516,12 +757,11 @@ def display_statistics(
     )
     stats_table.add_row("💾 输出文件", output_file, "")
 
-    # 显示表格
-    console.print(stats_table)
-    console.print()
+    # 在表格前添加标题, 表明这是关键信息, 与前后空行一次输出
+    console.print("\n[bold cyan]📊 关键信息：处理统计报告[/bold cyan]", stats_table, "")
 
 
-@dataclass
+@dataclass(slots=True)
 class DocumentNode:
     """文档节点类, 用于构建文档树结构"""
 
@@ -602,7 +842,7 @@ class DocumentStructure:
         self.batch_number = batch_number
 
     def to_dict(self) -> Dict[str, Any]:
-        """将文档结构转换为字典格式"""
+        """将文档结构转换为字典格式, 使用显式栈遍历避免深层递归"""
 
         def node_to_dict(node: DocumentNode) -> Dict[str, Any]:
             return {
@@ -612,33 +852,64 @@ class DocumentStructure:
                 "content": node.content,
                 "batch_number": node.batch_number,
                 "metadata": node.metadata,
-                "children": [node_to_dict(child) for child in node.children],
+                "children": [],
             }
 
-        return node_to_dict(self.root)
+        root_dict = node_to_dict(self.root)
+        stack = [(self.root, root_dict)]
+        while stack:
+            node, node_dict = stack.pop()
+            for child in node.children:
+                child_dict = node_to_dict(child)
+                node_dict["children"].append(child_dict)
+                stack.append((child, child_dict))
+
+        return root_dict
+
+
+def format_doc_content_plain(doc_structure: DocumentStructure) -> str:
+    """将文档结构格式化为缩进的纯文本"""
+    lines = ["", "📄 文档结构"]
+    stack = [(1, child) for child in reversed(doc_structure.root.children)]
+    while stack:
+        depth, node = stack.pop()
+        indent = "  " * depth
+        icon = NODE_STYLES.get(node.node_type, DEFAULT_NODE_STYLE)[1]
+
+        title = f"{indent}{icon} {node.title}"
+        if node.batch_number and node.level <= 1:
+            title += f" (第{node.batch_number}批)"
+        lines.append(title)
+
+        if node.content and node.content != node.title:
+            lines.extend(f"{indent}  {line}" for line in wrap_text(node.content))
+        if node.metadata:
+            lines.extend(
+                f"{indent}  {key}: {value}" for key, value in node.metadata.items()
+            )
+
+        stack.extend((depth + 1, child) for child in reversed(node.children))
+    lines.append("")
+    return "\n".join(lines)
 
 
 def display_doc_content(doc_structure: DocumentStructure) -> None:
     """使用树形结构显示文档内容"""
+    # 输出不是终端时只输出缩进的纯文本, 跳过Rich树和面板的构建
+    if not console.is_terminal:
+        console.out(format_doc_content_plain(doc_structure))
+        return
 
-    def get_node_style(node: DocumentNode) -> Tuple[str, str]:
-        """获取节点的样式和图标"""
-        styles = {
-            "root": ("bold blue", "📑"),
-            "section": ("bold cyan", "📌"),
-            "subsection": ("bold yellow", "📎"),
-            "numbered_section": ("bold green", "🔢"),
-            "numbered_subsection": ("bold magenta", "📍"),
-            "table": ("bold blue", "📊"),
-            "text": ("white", "📝"),
-            "note": ("bold magenta", "ℹ️"),
-            "correction": ("bold red", "⚠️"),
-        }
-        return styles.get(node.node_type, ("white", "•"))
-
-    def add_node_to_tree(tree: Tree, node: DocumentNode) -> None:
-        """递归添加节点到树中"""
-        style, icon = get_node_style(node)
+    # 创建主树, 使用显式栈按深度优先顺序添加节点, 避免逐层递归调用
+    tree = Tree("📄 文档结构", style="bold blue")
+    stack: List[Tuple[Tree, DocumentNode]] = [
+        (tree, child) for child in reversed(doc_structure.root.children)
+    ]
+    # 循环内频繁使用的方法绑定为局部变量
+    pop, push, get_style = stack.pop, stack.extend, NODE_STYLES.get
+    while stack:
+        parent, node = pop()
+        style, icon = get_style(node.node_type, DEFAULT_NODE_STYLE)
 
         # 构建节点标题
         title = f"{icon} {node.title}"
@@ -646,33 +917,26 @@ def display_doc_content(doc_structure: DocumentStructure) -> None:
             title += f" [dim](第{node.batch_number}批)[/dim]"
 
         # 创建节点
-        branch = tree.add(f"[{style}]{title}[/{style}]")
+        branch = parent.add(f"[{style}]{title}[/{style}]")
 
-        # 添加内容（如果有且与标题不同）
+        # 添加内容（如果有且与标题不同）, 多行内容合并为一个子节点渲染
         if node.content and node.content != node.title:
-            content_lines = textwrap.wrap(node.content, width=100)
-            for line in content_lines:
-                branch.add(f"[dim]{line}[/dim]")
+            content = "\n".join(wrap_text(node.content))
+            branch.add(f"[dim]{content}[/dim]")
 
         # 添加元数据（如果有）
         if node.metadata:
             meta_branch = branch.add("[dim]元数据[/dim]")
-            for key, value in node.metadata.items():
-                meta_branch.add(f"[dim]{key}: {value}[/dim]")
-
-        # 递归处理子节点
-        for child in node.children:
-            add_node_to_tree(branch, child)
+            metadata = "\n".join(
+                f"{key}: {value}" for key, value in node.metadata.items()
+            )
+            meta_branch.add(f"[dim]{metadata}[/dim]")
 
-    # 创建主树
-    tree = Tree("📄 文档结构", style="bold blue")
-    for child in doc_structure.root.children:
-        add_node_to_tree(tree, child)
+        # 子节点逆序入栈, 出栈时保持原有顺序
+        push((branch, child) for child in reversed(node.children))
 
-    # 显示树
-    console.print("\n")
-    console.print(Panel(tree, border_style="blue"))
-    console.print()
+    # 显示树, 与前后空行一次输出
+    console.print("\n", Panel(tree, border_style="blue"), "")
 
 
 def display_comparison(new_models: Set[str], removed_models: Set[str]) -> None:
@@ -680,10 +944,7 @@ def display_comparison(new_models: Set[str], removed_models: Set[str]) -> None:
     # 创建对比表格
     compare_table = Table(
         title="🔄 型号对比",
-        title_style="bold cyan",
-        show_header=True,
-        header_style="bold green",
-        border_style="blue",
+        **TABLE_STYLE,
     )
 
     # 添加列
@@ -693,18 +954,16 @@ def display_comparison(new_models: Set[str], removed_models: Set[str]) -> None:
 
     # 添加新增型号
     if new_models:
-        models_text = "\n".join(f"✨ {model}" for model in sorted(new_models))
+        models_text = "✨ " + "\n✨ ".join(sorted(new_models))
         compare_table.add_row("➕ 新增", str(len(new_models)), models_text)
 
     # 添加移除型号
     if removed_models:
-        models_text = "\n".join(f"❌ {model}" for model in sorted(removed_models))
+        models_text = "❌ " + "\n❌ ".join(sorted(removed_models))
         compare_table.add_row("➖ 移除", str(len(removed_models)), models_text)
 
     if new_models or removed_models:
-        console.print()
-        console.print(compare_table)
-        console.print()
+        console.print("", compare_table, "")
     else:
         console.print(Panel("[green]✅ 没有型号变更[/green]", border_style="green"))
 
@@ -745,32 +1004,17 @@ def process_doc(
 
 def verify_all_batches(all_cars_data: List[Dict[str, Any]]) -> Dict[str, Any]:
     """验证所有批次的数据一致性"""
-    # 按批次分组
-    batch_data: Dict[str, List[Dict[str, Any]]] = {}
+    # 按批次分组, 只收集表格ID, 计数交给Counter在C层完成
+    batch_tables: Dict[str, List[Any]] = defaultdict(list)
     for car in all_cars_data:
         batch = car.get("batch")
-        if not batch:
-            continue
-
-        if batch not in batch_data:
-            batch_data[batch] = []
-        batch_data[batch].append(car)
+        if batch:
+            batch_tables[batch].append(car.get("table_id", "未知"))
 
     # 验证每个批次
     results = {}
-    for batch, cars in batch_data.items():
-        # 按表格分组
-        table_counts = {}
-        for car in cars:
-            table_id = car.get("table_id", "未知")
-            if table_id not in table_counts:
-                table_counts[table_id] = 0
-            table_counts[table_id] += 1
-
-        # 总计
-        total_count = len(cars)
-
-        results[batch] = {"total": total_count, "table_counts": table_counts}
+    for batch, table_ids in batch_tables.items():
+        results[batch] = {"total": len(table_ids), "table_counts": Counter(table_ids)}
 
     return results
 
@@ -787,13 +1031,55 @@ def display_batch_verification(batch_results: Dict[str, Any]) -> None:
         )
         return
 
+    # 计算批次总数, 如果超过一定数量, 只显示部分
+    batch_count = len(batch_results)
+    show_all = batch_count <= 50  # 只有50个批次以内才全部显示
+
+    # 合计按全部批次统计, 不受显示截断影响
+    total_records = sum(data["total"] for data in batch_results.values())
+    total_tables = sum(len(data["table_counts"]) for data in batch_results.values())
+
+    def batch_key(item: Tuple[str, Any]) -> Tuple[int, int, str]:
+        return batch_sort_key(item[0])
+
+    def batch_rows(batches: Iterable[Tuple[str, Any]]) -> List[Tuple[str, str, str]]:
+        return [
+            (f"第{batch}批", str(data["total"]), str(len(data["table_counts"])))
+            for batch, data in batches
+        ]
+
+    # 如果批次太多, 只选出前20个和后20个, 无需对全部批次排序
+    if show_all:
+        head = batch_rows(sorted(batch_results.items(), key=batch_key))
+        tail: List[Tuple[str, str, str]] = []
+        notice = ""
+    else:
+        head = batch_rows(heapq.nsmallest(20, batch_results.items(), key=batch_key))
+        tail = batch_rows(
+            heapq.nlargest(20, batch_results.items(), key=batch_key)[::-1]
+        )
+        notice = f"注意：只显示前20个和后20个批次（共{batch_count}个批次）"
+    # 在前后两段之间添加省略提示行
+    gap = (f"... (省略 {batch_count - 40} 个批次) ...", "...", "...")
+
+    # 批次很多且输出不是终端时一次写出纯文本, 跳过Rich表格的构建和排版
+    if not console.is_terminal and batch_count > PLAIN_BATCH_SUMMARY_THRESHOLD:
+        lines = ["", "📊 关键信息：批次数据汇总"]
+        if notice:
+            lines.append(notice)
+        lines.append("批次\t记录数\t表格数")
+        lines += ["\t".join(row) for row in head]
+        if tail:
+            lines.append("\t".join(gap))
+            lines += ["\t".join(row) for row in tail]
+        lines += [f"合计\t{total_records}\t{total_tables}", ""]
+        console.out("\n".join(lines))
+        return
+
     # 创建批次汇总表格
     summary_table = Table(
         title="🔍 批次数据汇总",
-        title_style="bold cyan",
-        show_header=True,
-        header_style="bold green",
-        border_style="blue",
+        **TABLE_STYLE,
     )
 
     # 添加列
@@ -801,34 +1087,14 @@ def display_batch_verification(batch_results: Dict[str, Any]) -> None:
     summary_table.add_column("记录数", justify="right", style="green")
     summary_table.add_column("表格数", justify="right", style="yellow")
 
-    # 计算批次总数, 如果超过一定数量, 只显示部分
-    batch_count = len(batch_results)
-    show_all = batch_count <= 50  # 只有50个批次以内才全部显示
-
-    # 添加批次数据
-    total_records = 0
-    total_tables = 0
-
-    sorted_batches = sorted(batch_results.items())
-
-    # 如果批次太多, 只显示前20个和后20个
-    if not show_all:
-        display_batches = sorted_batches[:20] + sorted_batches[-20:]
-        console.print(
-            f"[yellow]注意：只显示前20个和后20个批次（共{batch_count}个批次）[/yellow]"
-        )
-    else:
-        display_batches = sorted_batches
-
-    for batch, data in display_batches:
-        total_records += data["total"]
-        table_count = len(data["table_counts"])
-        total_tables += table_count
-        summary_table.add_row(f"第{batch}批", str(data["total"]), str(table_count))
-
-    # 如果有省略的批次, 添加省略提示行
-    if not show_all and batch_count > 40:
-        summary_table.add_row(f"... (省略 {batch_count - 40} 个批次) ...", "...", "...")
+    renderables: List[Any] = []
+    for row in head:
+        summary_table.add_row(*row)
+    if tail:
+        renderables.append(f"[yellow]{notice}[/yellow]")
+        summary_table.add_row(*gap)
+        for row in tail:
+            summary_table.add_row(*row)
 
     # 添加合计行
     summary_table.add_row(
@@ -837,11 +1103,34 @@ def display_batch_verification(batch_results: Dict[str, Any]) -> None:
         f"[bold]{total_tables}[/bold]",
     )
 
-    # 在表格前添加标题, 表明这是关键信息
-    console.print()
-    console.print("[bold cyan]📊 关键信息：批次数据汇总[/bold cyan]")
-    console.print(summary_table)
-    console.print()
+    # 在表格前添加标题, 表明这是关键信息, 与前后空行一次输出
+    renderables += [
+        "\n[bold cyan]📊 关键信息：批次数据汇总[/bold cyan]",
+        summary_table,
+        "",
+    ]
+    console.print(*renderables, sep="\n")
+
+
+def create_progress() -> Progress:
+    """
+    创建文件处理进度条
+    列对象每次新建, 旋转动画和剩余时间估算的状态不会在进度条之间共享
+    """
+    return Progress(
+        "[progress.description]{task.description}",
+        SpinnerColumn(),
+        BarColumn(bar_width=None),
+        "[progress.percentage]{task.percentage:>3.1f}%",
+        "•",
+        "[bold blue]{task.completed}/{task.total}",
+        "•",
+        TimeRemainingColumn(),
+        "•",
+        TimeElapsedColumn(),
+        console=console,
+        transient=True,
+    )
 
 
 def process_files(
@@ -876,20 +1165,7 @@ def process_files(
         logger.info(f"使用 {num_processes} 个进程处理 {len(doc_files)} 个文件")
 
         with mp.Pool(num_processes) as pool:
-            with Progress(
-                "[progress.description]{task.description}",
-                SpinnerColumn(),
-                BarColumn(bar_width=None),
-                "[progress.percentage]{task.percentage:>3.1f}%",
-                "•",
-                "[bold blue]{task.completed}/{task.total}",
-                "•",
-                TimeRemainingColumn(),
-                "•",
-                TimeElapsedColumn(),
-                console=console,
-                transient=True,
-            ) as progress:
+            with create_progress() as progress:
                 main_task = progress.add_task(
                     "[bold cyan]🔄 处理文件", total=len(doc_files)
                 )
@@ -939,7 +1215,7 @@ def process_files(
 
                     # 使用分块处理
                     chunk_size = 50000
-                    with open(output, "w", encoding="utf-8-sig") as f:
+                    with open(output, "w", encoding="utf-8-sig", newline="") as f:
                         # 写入表头
                         first_batch: List[Dict[str, Any]] = all_cars_data[
                             :100
@@ -967,41 +1243,28 @@ def process_files(
                             col for col in sorted(all_fields) if col not in base_columns
                         ]
 
-                        f.write(",".join(header_fields) + "\n")
+                        # 直接流式写出字典, 不再为每个分块构造DataFrame
+                        writer = csv.DictWriter(
+                            f,
+                            fieldnames=header_fields,
+                            extrasaction="ignore",
+                            lineterminator="\n",
+                        )
+                        writer.writeheader()
 
                         # 分块写入数据
                         for i in range(0, len(all_cars_data), chunk_size):
-                            chunk = all_cars_data[i : i + chunk_size]
-                            chunk_df = pd.DataFrame(chunk)
-                            chunk_df = chunk_df.reindex(columns=header_fields)
-
-                            if i == 0:
-                                chunk_df.to_csv(
-                                    f, index=False, header=False, encoding="utf-8-sig"
-                                )
-                            else:
-                                chunk_df.to_csv(
-                                    f,
-                                    index=False,
-                                    header=False,
-                                    encoding="utf-8-sig",
-                                    mode="a",
-                                )
-
-                            # 释放内存
-                            del chunk_df
-                            gc.collect()
+                            writer.writerows(all_cars_data[i : i + chunk_size])
 
                     logger.info(f"💾 处理完成, 保存结果到: {output}")
                     logger.info(f"📊 总记录数: {len(all_cars_data)}")
 
-                    # 计算统计数据
-                    energy_saving_count = sum(
-                        1 for car in all_cars_data if car.get("energytype") == 2
-                    )
-                    new_energy_count = sum(
-                        1 for car in all_cars_data if car.get("energytype") == 1
+                    # 计算统计数据, 单次遍历同时统计两类车型
+                    energy_counts = Counter(
+                        car.get("energytype") for car in all_cars_data
                     )
+                    energy_saving_count = energy_counts[2]
+                    new_energy_count = energy_counts[1]
 
                     # 始终显示统计信息, 即使在简洁模式下
                     display_statistics(
@@ -1132,6 +1395,24 @@ def profile_function(func: Callable[..., Any]) -> Callable[..., Any]:
     return wrapper
 
 
+def load_yaml(path: str) -> Any:
+    """加载YAML文件"""
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=YamlLoader)
+
+
+def _ensure_log_directory(config: Dict[str, Any]) -> None:
+    """为日志配置中的文件处理器创建所需目录, 每个目录只创建一次"""
+    log_dirs = {
+        os.path.dirname(handler["filename"])
+        for handler in config.get("handlers", {}).values()
+        if "filename" in handler
+    }
+    for log_dir in log_dirs:
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
+
+
 def setup_logging(
     default_path: str = "logging.yaml",
     default_level: Union[str, int] = logging.INFO,
@@ -1140,13 +1421,13 @@ def setup_logging(
     """配置日志记录"""
     path = os.getenv(env_key, default_path)
     if os.path.exists(path):
-        with open(path, "rt") as f:
-            try:
-                config = yaml.safe_load(f.read())
-                logging.config.dictConfig(config)
-            except Exception as e:
-                print(f"加载日志配置出错: {e}")
-                setup_default_logging(default_level)
+        try:
+            config = load_yaml(path)
+            _ensure_log_directory(config)
+            logging.config.dictConfig(config)
+        except Exception as e:
+            print(f"加载日志配置出错: {e}")
+            setup_default_logging(default_level)
     else:
         setup_default_logging(default_level)
 
@@ -1154,8 +1435,7 @@ def setup_logging(
 def setup_default_logging(level: Any) -> None:
     """设置默认日志配置"""
     log_dir = "logs"
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
+    os.makedirs(log_dir, exist_ok=True)
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     log_file = os.path.join(log_dir, f"doc_processor_{timestamp}.log")
@@ -1192,8 +1472,7 @@ def load_config(config_path: str = "config.yaml") -> Dict[Any, Any]:
     """加载配置文件"""
     try:
         if os.path.exists(config_path):
-            with open(config_path, "r", encoding="utf-8") as f:
-                config: Dict[Any, Any] = yaml.safe_load(f)
+            config: Dict[Any, Any] = load_yaml(config_path)
             return config
         return {}
     except Exception as e:
@@ -1219,7 +1498,6 @@ class DocProcessor:
         self.current_category: Optional[str] = None
         self.current_type: Optional[str] = None
         self.batch_number: Optional[str] = None
-        self._table_cache: Dict[int, List[Dict[str, Any]]] = {}
         self.cars: List[Dict[str, Any]] = []
         self._processing_times: Dict[str, float] = {}
         self.declared_count: Optional[int] = None  # 声明的总记录数
@@ -1227,23 +1505,19 @@ class DocProcessor:
         # 从配置文件加载设置
         self._chunk_size = self.config.get("chunk_size", 1000)
         self.verbose = verbose
-        self._cache_size_limit = self.config.get("cache_size_limit", 50 * 1024 * 1024)
-        self._cleanup_interval = self.config.get("cleanup_interval", 300)
+        # 结构树仅用于详细模式下的文档结构显示, 大文件不显示也就无需构建
+        self._build_structure = verbose and self._file_size <= 50 * 1024 * 1024
         # 添加跳过总记录数检查的配置选项
         self._skip_count_check = self.config.get("skip_count_check", False)
         # 设置搜索限制
         self._max_paragraphs_to_search = self.config.get("max_paragraphs_to_search", 30)
         self._max_tables_to_search = self.config.get("max_tables_to_search", 5)
 
-        # 预编译正则表达式
-        self._batch_pattern = re.compile(r"第([一二三四五六七八九十百零\d]+)批")
-        self._whitespace_pattern = re.compile(r"\s+")
-        self._chinese_number_pattern = re.compile(r"([一二三四五六七八九十百零]+)")
-        self._count_pattern = re.compile(
-            r"(共计|总计|合计).*?(\d+).*?(款|个|种|辆|台|项)"
-        )  # 总记录数模式
+        # 复用模块级预编译的正则表达式
+        self._batch_pattern = BATCH_NUMBER_PATTERN
+        self._whitespace_pattern = WHITESPACE_PATTERN
+        self._chinese_number_pattern = CHINESE_NUMBER_PATTERN
 
-        self._last_cache_cleanup = time.time()
         self.logger.info(f"初始化文档处理器: {doc_path}")
 
         self.current_section: Optional[DocumentNode] = None
@@ -1255,33 +1529,19 @@ class DocProcessor:
     def _load_document(self) -> None:
         """安全加载文档, 处理大文件"""
         try:
-            file_size = os.path.getsize(self.doc_path)
+            file_size = self._file_size = os.path.getsize(self.doc_path)
             self.logger.info(
                 f"加载文档 {self.doc_path}, 大小: {file_size/1024/1024:.2f}MB"
             )
 
             if file_size > 100 * 1024 * 1024:  # 100MB
-                self.logger.warning("文档大小超过100MB, 使用临时文件处理")
-                with tempfile.NamedTemporaryFile(delete=False) as tmp:
-                    shutil.copy2(self.doc_path, tmp.name)
-                    self.doc = Document(tmp.name)
-                    os.unlink(tmp.name)
-            else:
-                self.doc = Document(self.doc_path)
+                self.logger.warning("文档大小超过100MB, 加载可能占用较多内存")
+            # 直接从原路径加载, 复制到临时文件并不能降低解析开销
+            self.doc = Document(self.doc_path)
         except Exception as e:
             self.logger.error(f"加载文档失败: {str(e)}")
             raise DocumentError(f"无法加载文档 {self.doc_path}: {str(e)}")
 
-    def _check_and_cleanup_cache(self) -> None:
-        """检查并清理缓存"""
-        current_time = time.time()
-        if current_time - self._last_cache_cleanup > self._cleanup_interval:
-            cache_size = sum(len(str(v)) for v in self._table_cache.values())
-            if cache_size > self._cache_size_limit:
-                self._table_cache.clear()
-                gc.collect()
-            self._last_cache_cleanup = current_time
-
     def _extract_table_cells_fast(self, table: Any) -> List[List[str]]:
         """优化的表格提取方法"""
         try:
@@ -1291,12 +1551,11 @@ class DocProcessor:
             last_brand = ""
 
             # 使用lxml的xpath直接提取文本
-            for row in table._tbl.xpath(".//w:tr"):
-                cells = []
-                for cell in row.xpath(".//w:tc"):
-                    # 直接获取所有文本节点
-                    text = "".join(t.text for t in cell.xpath(".//w:t"))
-                    cells.append(text.strip())
+            for row in TABLE_ROW_XPATH(table._tbl):
+                cells = [
+                    "".join(CELL_TEXT_XPATH(cell)).strip()
+                    for cell in TABLE_CELL_XPATH(row)
+                ]
 
                 if not header_processed:
                     processed_headers = self._process_merged_headers(cells)
@@ -1312,9 +1571,6 @@ class DocProcessor:
                         last_brand = processed_row[2]
                     rows.append(processed_row)
 
-                # 定期检查缓存
-                self._check_and_cleanup_cache()
-
             return rows
         except Exception as e:
             logging.error(f"表格提取错误: {str(e)}")
@@ -1341,23 +1597,21 @@ class DocProcessor:
         self, row: List[str], last_company: str, last_brand: str
     ) -> Optional[List[str]]:
         """处理数据行, 包括空值处理和数据继承"""
+        processed = [cell.strip() for cell in row]
+
         # 跳过全空行
-        if not any(cell.strip() for cell in row):
+        if not any(processed):
             return None
 
         # 处理合计行
-        if any(cell.strip().startswith(("合计", "总计")) for cell in row):
+        if any(value.startswith(("合计", "总计")) for value in processed):
             return None
 
-        processed = []
-        for i, cell in enumerate(row):
-            value = cell.strip()
-            if i == 1 and not value:  # 企业名称为空
-                processed.append(last_company)
-            elif i == 2 and not value:  # 品牌/通用名称为空
-                processed.append(last_brand)
-            else:
-                processed.append(value)
+        # 企业名称、品牌/通用名称为空时沿用上一行
+        if len(processed) > 1 and not processed[1]:
+            processed[1] = last_company
+        if len(processed) > 2 and not processed[2]:
+            processed[2] = last_brand
 
         return processed
 
@@ -1388,19 +1642,24 @@ class DocProcessor:
 
         start_time = time.time()
 
-        # 1. 只搜索前N个段落
-        paragraphs_to_search = min(
-            self._max_paragraphs_to_search, len(self.doc.paragraphs)
+        body = self.doc.element.body
+        # 段落和表格两处查找共用的总记录数
+        count: Optional[int]
+
+        # 1. 只搜索前N个段落, 按需构建段落对象而不是物化全部段落
+        self.logger.debug(
+            f"搜索前 {self._max_paragraphs_to_search} 个段落以寻找总记录数"
         )
-        self.logger.debug(f"搜索前 {paragraphs_to_search} 个段落以寻找总记录数")
 
-        for i, para in enumerate(self.doc.paragraphs[:paragraphs_to_search]):
-            text = para.text.strip()
+        for p in islice(
+            body.iterchildren(PARAGRAPH_TAG), self._max_paragraphs_to_search
+        ):
+            text = Paragraph(p, self.doc).text.strip()
             if not text:
                 continue
 
-            if "总" in text or "共" in text or "合计" in text:
-                match = self._count_pattern.search(text)
+            if COUNT_TRIGGER_PATTERN.search(text):
+                match = COUNT_PATTERN.search(text)
                 if match:
                     try:
                         count = int(match.group(2))
@@ -1413,49 +1672,51 @@ class DocProcessor:
                         continue
 
         # 2. 只搜索前M个表格
-        tables_to_search = min(self._max_tables_to_search, len(self.doc.tables))
-        self.logger.debug(f"搜索前 {tables_to_search} 个表格以寻找总记录数")
+        self.logger.debug(f"搜索前 {self._max_tables_to_search} 个表格以寻找总记录数")
 
-        for i, table in enumerate(self.doc.tables[:tables_to_search]):
-            if not table.rows:
+        for tbl in islice(body.iterchildren(TABLE_TAG), self._max_tables_to_search):
+            rows = list(DocxTable(tbl, self.doc).rows)
+            if not rows:
                 continue
 
             # 只检查表格的前3行和后3行, 这些位置最可能出现合计信息
-            rows_to_check = []
-            if len(table.rows) > 6:
-                rows_to_check = list(table.rows[:3]) + list(table.rows[-3:])
-            else:
-                rows_to_check = list(table.rows)
+            rows_to_check = rows[:3] + rows[-3:] if len(rows) > 6 else rows
 
             for row in rows_to_check:
-                cells = [cell.text.strip() for cell in row.cells]
-                # 检查是否包含合计相关的内容
-                if any(cell.startswith(("合计", "总计")) for cell in cells):
-                    # 尝试从合计行中获取数值
-                    for cell in cells:
-                        if cell.isdigit():
-                            count = int(cell)
-                            search_time = time.time() - start_time
-                            self.logger.info(
-                                f"从表格合计行中提取到总记录数: {count} (搜索耗时: {search_time:.2f}秒)"
-                            )
-                            return count
+                # 单次遍历单元格: 同时检查合计标识并记录第一个纯数字单元格
+                is_total_row = False
+                count = None
+                for cell in row.cells:
+                    text = cell.text.strip()
+                    if not is_total_row and text.startswith(("合计", "总计")):
+                        is_total_row = True
+                    if count is None and text.isdigit():
+                        count = int(text)
+                    if is_total_row and count is not None:
+                        search_time = time.time() - start_time
+                        self.logger.info(
+                            f"从表格合计行中提取到总记录数: {count} (搜索耗时: {search_time:.2f}秒)"
+                        )
+                        return count
 
         search_time = time.time() - start_time
         self.logger.warning(f"未能找到批次总记录数声明 (搜索耗时: {search_time:.2f}秒)")
         return None
 
+    def _print_table_progress(self, done: int, total: int) -> None:
+        """输出大表格的处理进度"""
+        progress = done / total * 100
+        console.print(f"[dim]处理进度: {progress:.1f}% ({done}/{total})[/dim]")
+
     def _extract_car_info(
-        self, table_index: int, batch_number: Optional[str] = None
+        self, table_index: int, table: DocxTable, batch_number: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """从表格中提取车辆信息, 使用优化的处理方式"""
-        # 检查缓存
-        if table_index in self._table_cache:
-            return self._table_cache[table_index]
-
+        """
+        从表格中提取车辆信息, 使用优化的处理方式
+        表格对象由调用方传入, 避免每次通过doc.tables重建全部表格包装
+        """
         start_time = time.time()
         table_cars: List[Dict[str, Any]] = []
-        table = self.doc.tables[table_index]
 
         if not table or not table.rows:
             return table_cars
@@ -1512,59 +1773,49 @@ class DocProcessor:
         if total_rows > 100:
             console.print(f"[dim]开始处理大表格, 共 {total_rows} 行[/dim]")
 
-        # 分块处理数据行
-        for chunk_start in range(1, len(all_rows), self._chunk_size):
-            chunk_end = min(chunk_start + self._chunk_size, len(all_rows))
-            chunk_rows = all_rows[chunk_start:chunk_end]
+        # 逐行处理数据行, 大表格每处理完一个块输出一次进度
+        for row_idx, cells in enumerate(islice(all_rows, 1, None), 1):
+            if (
+                total_rows > 100
+                and row_idx > 1
+                and (row_idx - 1) % self._chunk_size == 0
+            ):
+                self._print_table_progress(row_idx - 1, total_rows)
 
-            # 批量处理当前块的数据行
-            for row_idx, cells in enumerate(chunk_rows, chunk_start):
-                # 跳过空行
-                if not any(str(cell).strip() for cell in cells):
-                    continue
+            # 跳过空行
+            if not any(cell.strip() for cell in cells):
+                continue
 
-                # 记录列数不匹配的情况, 但仍然处理数据
-                if len(cells) != len(headers):
-                    if self.verbose:
-                        console.print(
-                            f"[yellow]表格 {table_index + 1} 第 {row_idx} 行列数不匹配: "
-                            f"预期 {len(headers)} 列, 实际 {len(cells)} 列[/yellow]"
-                        )
-                        console.print(f"行内容: {cells}")
-                    # 调整单元格数量以匹配表头
-                    if len(cells) > len(headers):
-                        cells = cells[: len(headers)]
-                    else:
-                        cells.extend([""] * (len(headers) - len(cells)))
-
-                # 创建新的字典, 避免引用同一个对象
-                car_info = base_info.copy()
-                car_info["raw_text"] = " | ".join(str(cell) for cell in cells)
-
-                # 使用zip优化字段映射, 同时清理文本
-                car_info.update(
-                    {
-                        header: clean_text(str(value))
-                        for header, value in zip(headers, cells)
-                    }
-                )
+            # 记录列数不匹配的情况, 但仍然处理数据
+            if len(cells) != len(headers):
+                if self.verbose:
+                    console.print(
+                        f"[yellow]表格 {table_index + 1} 第 {row_idx} 行列数不匹配: "
+                        f"预期 {len(headers)} 列, 实际 {len(cells)} 列[/yellow]"
+                    )
+                    console.print(f"行内容: {cells}")
+                # 按表头对齐单元格: 多余的截断, 缺少的补空字符串
+                aligned = zip_longest(headers, cells, fillvalue="")
+                cells = [value for _, value in islice(aligned, len(headers))]
+
+            # 一次构造新的字典: 基础信息、原始文本及清理后的字段映射
+            car_info = {
+                **base_info,
+                "raw_text": " | ".join(cells),
+                **{header: clean_text(value) for header, value in zip(headers, cells)},
+            }
 
-                # 处理车辆信息
-                car_info = process_car_info(car_info, batch_number)
-                table_cars.append(car_info)
+            table_cars.append(car_info)
 
-            if total_rows > 100:
-                progress = (chunk_end - 1) / total_rows * 100
-                console.print(
-                    f"[dim]处理进度: {progress:.1f}% ({chunk_end-1}/{total_rows})[/dim]"
-                )
+        # 整张表格的记录一次性合并和标准化字段
+        table_cars = process_car_infos(table_cars, batch_number)
 
-            # 主动触发垃圾回收
-            if len(table_cars) > 5000:
-                gc.collect()
+        if total_rows > 100:
+            self._print_table_progress(total_rows, total_rows)
 
-        # 缓存结果
-        self._table_cache[table_index] = table_cars
+        # 主动触发垃圾回收
+        if len(table_cars) > 5000:
+            gc.collect()
 
         # 记录处理时间和统计信息
         elapsed = time.time() - start_time
@@ -1596,11 +1847,15 @@ class DocProcessor:
             row_count = 0
             error_count = 0
 
-            # 遍历文档中的所有元素
-            for element in self.doc.element.body:
+            # 预先建立表格元素到(索引, 表格)的映射, 避免每个表格都线性查找
+            tbl_map = {id(t._element): (i, t) for i, t in enumerate(self.doc.tables)}
+
+            # 遍历文档中的顶层段落和表格, 跳过分节属性等其他元素
+            for element in BODY_BLOCK_XPATH(self.doc.element.body):
                 try:
-                    # 处理段落
-                    if element.tag.endswith("p"):
+                    # 处理段落, XPath只返回段落和表格, 按完整标签名分派
+                    tag = element.tag
+                    if tag == PARAGRAPH_TAG:
                         text = element.text.strip()
                         if not text:
                             continue
@@ -1611,30 +1866,25 @@ class DocProcessor:
                             if self.batch_number:
                                 self.doc_structure.set_batch_number(self.batch_number)
                                 self.logger.info(f"提取到批次号: {self.batch_number}")
-                                self.doc_structure.add_node(
-                                    f"第{self.batch_number}批", "batch", level=0
-                                )
+                                if self._build_structure:
+                                    self.doc_structure.add_node(
+                                        f"第{self.batch_number}批", "batch", level=0
+                                    )
+
+                        # 一次匹配得到段落类别
+                        match = PARAGRAPH_CLASS_PATTERN.match(text)
+                        kind: str = (match.lastgroup if match else None) or "text"
 
                         # 更新分类信息
-                        if "节能型汽车" in text:
-                            self.current_category = "节能型"
-                            self.current_section = self.doc_structure.add_node(
-                                "节能型汽车", "section", content=text
-                            )
-                            self.current_subsection = None
-                            self.current_numbered_section = None
-                            self.logger.debug(f"更新分类: {self.current_category}")
-                        elif "新能源汽车" in text:
-                            self.current_category = "新能源"
+                        if kind in SECTION_CATEGORIES:
+                            title, self.current_category = SECTION_CATEGORIES[kind]
                             self.current_section = self.doc_structure.add_node(
-                                "新能源汽车", "section", content=text
+                                title, "section", content=text
                             )
                             self.current_subsection = None
                             self.current_numbered_section = None
                             self.logger.debug(f"更新分类: {self.current_category}")
-                        elif text.startswith("（") and not any(
-                            str.isdigit() for str in text
-                        ):
+                        elif kind == "subsection":
                             self.current_subsection = self.doc_structure.add_node(
                                 text.strip(),
                                 "subsection",
@@ -1644,7 +1894,7 @@ class DocProcessor:
                             self.current_numbered_section = None
                             self.logger.debug(f"更新类型: {text}")
                         # 处理带数字编号的节点
-                        elif text.startswith(("1.", "2.", "3.", "4.", "5.")):
+                        elif kind == "numbered_section":
                             self.current_numbered_section = self.doc_structure.add_node(
                                 text.strip(),
                                 "numbered_section",
@@ -1654,61 +1904,43 @@ class DocProcessor:
                             )
                             self.logger.debug(f"更新编号节点: {text}")
                         # 处理带括号数字编号的子节点
-                        elif text.startswith("（") and any(
-                            num in text for num in "123456789"
-                        ):
-                            if self.current_numbered_section:
+                        elif kind == "numbered_subsection":
+                            if self._build_structure:
                                 self.doc_structure.add_node(
                                     text.strip(),
                                     "numbered_subsection",
                                     content=text,
-                                    parent_node=self.current_numbered_section,
-                                )
-                            else:
-                                self.doc_structure.add_node(
-                                    text.strip(),
-                                    "numbered_subsection",
-                                    content=text,
-                                    parent_node=self.current_subsection
+                                    parent_node=self.current_numbered_section
+                                    or self.current_subsection
                                     or self.current_section,
                                 )
                             self.logger.debug(f"更新编号子节点: {text}")
-                        elif "勘误" in text or "说明" in text:
-                            self.doc_structure.add_node(
-                                text[:40] + "...",
-                                "note",
-                                content=text,
-                                parent_node=self.current_section,
-                            )
-                        elif "更正" in text or "修改" in text:
-                            self.doc_structure.add_node(
-                                text[:40] + "...",
-                                "correction",
-                                content=text,
-                                parent_node=self.current_section,
-                            )
-                        else:
+                        elif self._build_structure:
+                            # 说明、更正及普通文本, 节点类型即段落类别
                             self.doc_structure.add_node(
                                 text[:40] + "...",
-                                "text",
+                                kind,
                                 content=text,
                                 parent_node=self.current_section,
                             )
 
                     # 处理表格
-                    elif element.tag.endswith("tbl"):
+                    elif tag == TABLE_TAG:
                         table_count += 1
-                        for i, table in enumerate(self.doc.tables):
-                            if table._element is element:
-                                if table.rows:
-                                    row_count += len(table.rows)
-                                try:
-                                    table_cars = self._extract_car_info(
-                                        i, self.batch_number
-                                    )
-                                    self.cars.extend(table_cars)
+                        entry = tbl_map.get(id(element))
+                        if entry is not None:
+                            i, table = entry
+                            # 行数直接取自XML, 不必为每行构造_Row对象
+                            n_rows = len(element.tr_lst)
+                            row_count += n_rows
+                            try:
+                                table_cars = self._extract_car_info(
+                                    i, table, self.batch_number
+                                )
+                                self.cars.extend(table_cars)
 
-                                    # 添加表格节点到正确的父节点
+                                # 添加表格节点到正确的父节点
+                                if self._build_structure:
                                     parent_node = (
                                         self.current_numbered_section
                                         or self.current_subsection
@@ -1718,9 +1950,9 @@ class DocProcessor:
                                         f"表格 {i+1}",
                                         "table",
                                         metadata={
-                                            "rows": len(table.rows),
+                                            "rows": n_rows,
                                             "columns": len(table.rows[0].cells)
-                                            if table.rows
+                                            if n_rows
                                             else 0,
                                             "records": len(table_cars),
                                             "category": self.current_category,
@@ -1731,14 +1963,13 @@ class DocProcessor:
                                         parent_node=parent_node,
                                     )
 
-                                    if self.verbose:
-                                        self.logger.info(
-                                            f"处理表格 {i+1}, 提取到 {len(table_cars)} 条记录"
-                                        )
-                                except Exception as e:
-                                    error_count += 1
-                                    self.logger.error(f"处理表格 {i+1} 出错: {str(e)}")
-                                break
+                                if self.verbose:
+                                    self.logger.info(
+                                        f"处理表格 {i+1}, 提取到 {len(table_cars)} 条记录"
+                                    )
+                            except Exception as e:
+                                error_count += 1
+                                self.logger.error(f"处理表格 {i+1} 出错: {str(e)}")
                 except Exception as e:
                     error_count += 1
                     self.logger.error(f"处理元素出错: {str(e)}")
@@ -1777,7 +2008,6 @@ class DocProcessor:
             self._display_consistency_result(consistency_result)
 
             # 处理完成后主动释放资源
-            self._table_cache.clear()
             gc.collect()
 
             return self.cars
@@ -1798,16 +2028,11 @@ class DocProcessor:
         if not self.batch_number:
             return {"status": "no_batch", "message": "未找到批次号"}
 
-        # 按表格分组统计车辆记录数
-        table_counts = {}
-        for car in self.cars:
-            table_id = car.get("table_id", "未知")
-            if table_id not in table_counts:
-                table_counts[table_id] = 0
-            table_counts[table_id] += 1
+        # 按表格分组统计车辆记录数, 记录按文档顺序提取, 键即按表格ID升序插入
+        table_counts = Counter(car.get("table_id", "未知") for car in self.cars)
 
-        # 计算从表格中提取的总记录数
-        total_extracted_count = sum(table_counts.values())
+        # 每条记录恰好计入一个表格, 提取总数即记录数, 无需再次求和
+        total_extracted_count = len(self.cars)
 
         # 获取批次声明的总记录数
         if self.declared_count is None:
@@ -1861,21 +2086,24 @@ class DocProcessor:
     def _display_consistency_result(self, result: Dict[str, Any]) -> None:
         """显示批次一致性验证结果"""
         # 在显示结果前添加标题, 表明这是关键信息
-        console.print()
-        console.print("[bold cyan]📊 关键信息：数据一致性检查[/bold cyan]")
+        # 标题、结果面板和分布表格收集后一次输出
+        renderables: List[Any] = [
+            "\n[bold cyan]📊 关键信息：数据一致性检查[/bold cyan]"
+        ]
 
         if result["status"] == "no_batch":
-            console.print(
+            renderables.append(
                 Panel(
                     "[yellow]⚠️ 未找到批次号, 无法验证数据一致性[/yellow]",
                     title="数据一致性检查",
                     border_style="yellow",
                 )
             )
+            console.print(*renderables)
             return
 
         if result["status"] == "unknown":
-            console.print(
+            renderables.append(
                 Panel(
                     f"[yellow]⚠️ 第{result['batch']}批：未找到总记录数声明, 实际记录数为 {result['actual_count']}[/yellow]",
                     title="数据一致性检查",
@@ -1883,7 +2111,7 @@ class DocProcessor:
                 )
             )
         elif result["status"] == "match":
-            console.print(
+            renderables.append(
                 Panel(
                     f"[green]✅ 第{result['batch']}批：记录数匹配, 共 {result['actual_count']} 条记录[/green]",
                     title="数据一致性检查",
@@ -1894,7 +2122,7 @@ class DocProcessor:
             diff_text = (
                 f"差异 {result['difference']} 条" if "difference" in result else ""
             )
-            console.print(
+            renderables.append(
                 Panel(
                     f"[red]❌ 第{result['batch']}批：记录数不匹配！声明 {result['declared_count']}, 实际 {result['actual_count']}, {diff_text}[/red]",
                     title="⚠️ 数据一致性检查",
@@ -1902,7 +2130,7 @@ class DocProcessor:
                 )
             )
         elif result["status"] == "internal_match":
-            console.print(
+            renderables.append(
                 Panel(
                     f"[green]✅ 第{result['batch']}批：内部一致性检查通过, 表格记录总数 {result['actual_count']} 与处理结果数 {result['processed_count']} 一致[/green]",
                     title="数据一致性检查",
@@ -1913,7 +2141,7 @@ class DocProcessor:
             diff_text = (
                 f"差异 {result['difference']} 条" if "difference" in result else ""
             )
-            console.print(
+            renderables.append(
                 Panel(
                     f"[red]❌ 第{result['batch']}批：内部一致性检查失败！表格记录总数 {result['actual_count']} 与处理结果数 {result['processed_count']} 不一致, {diff_text}[/red]",
                     title="⚠️ 数据一致性检查",
@@ -1926,26 +2154,37 @@ class DocProcessor:
         if table_counts:
             count_table = Table(
                 title="📊 表格记录分布",
-                title_style="bold cyan",
-                show_header=True,
-                header_style="bold green",
-                border_style="blue",
+                **TABLE_STYLE,
             )
             count_table.add_column("表格ID", style="cyan")
             count_table.add_column("记录数", justify="right", style="green")
             count_table.add_column("占比", justify="right", style="yellow")
 
-            total = result.get("actual_count", sum(table_counts.values()))
-
-            for table_id, count in sorted(table_counts.items()):
-                percentage = (count / total * 100) if total > 0 else 0
-                count_table.add_row(
-                    f"表格 {table_id}" if not isinstance(table_id, str) else table_id,
-                    str(count),
-                    f"{percentage:.1f}%",
-                )
-
-            console.print(count_table)
+            # 仅在结果缺少实际记录数时才对各表格计数求和
+            total = result.get("actual_count")
+            if total is None:
+                total = sum(table_counts.values())
+
+            # 预先计算比例系数, 循环内只需一次乘法
+            scale = 100.0 / total if total > 0 else 0.0
+            # 表格计数按文档顺序插入, 无需再次排序
+            # 数字ID与"未知"等文字ID先分组, 各自使用固定的标签格式, 文字ID排在最后
+            numbered = [
+                (f"表格 {table_id}", count)
+                for table_id, count in table_counts.items()
+                if not isinstance(table_id, str)
+            ]
+            named = [
+                (table_id, count)
+                for table_id, count in table_counts.items()
+                if isinstance(table_id, str)
+            ]
+            for label, count in numbered + named:
+                count_table.add_row(label, str(count), f"{count * scale:.1f}%")
+
+            renderables.append(count_table)
+
+        console.print(*renderables)
 
 
 @cli.command()
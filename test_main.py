@@ -1,6 +1,7 @@
 import pytest
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
+import docx
 from docx.document import Document
 from docx.table import Table
 from typing import TYPE_CHECKING
@@ -17,7 +18,14 @@ from main import (
     validate_car_info,
     get_table_type,
     process_car_info,
+    process_car_infos,
     extract_doc_content,
+    verify_all_batches,
+    batch_sort_key,
+    format_docx_content_plain,
+    iter_docx_preview,
+    PARAGRAPH_CLASS_PATTERN,
+    PREVIEW_CLASS_PATTERN,
     DocProcessor,
 )
 
@@ -49,6 +57,7 @@ def test_cn_to_arabic(input_num: str, expected: str):
         ("第六十五批", "65"),
         ("第一百零一批", "101"),
         ("第123批", "123"),
+        ("第 65 批", "65"),
         ("第一批", "1"),
         ("无批次信息", None),
         ("", None),
@@ -58,6 +67,12 @@ def test_extract_batch_number(input_text: str, expected: str | None):
     assert extract_batch_number(input_text) == expected
 
 
+# 测试批次排序键按数值排序
+def test_batch_sort_key():
+    batches = ["10", "9", "100", "1", "²", "未知"]
+    assert sorted(batches, key=batch_sort_key) == ["1", "9", "10", "100", "²", "未知"]
+
+
 # 测试文本清理
 @pytest.mark.parametrize(
     "input_text,expected",
@@ -67,6 +82,10 @@ def test_extract_batch_number(input_text: str, expected: str | None):
         ("测试；文本", "测试;文本"),
         ("测试\n文本", "测试 文本"),
         ("测试    文本", "测试 文本"),
+        ("测试 文本", "测试 文本"),
+        ("测试\t文本", "测试 文本"),
+        ("测试 　文本", "测试 文本"),
+        ("测试  文本，说明", "测试 文本,说明"),
     ],
 )
 def test_clean_text(input_text: str, expected: str):
@@ -213,6 +232,18 @@ def test_process_car_info(car_info: dict, batch_number: str, expected: dict):
         assert result[key] == value
 
 
+# 测试批量处理车辆信息
+def test_process_car_infos():
+    car_infos = [
+        {"产品型号": "TEST001", "通用名称": "测试品牌", "企业名称": " 测试企业 "},
+        {"车辆型号": "TEST002", "商标": "测试品牌2", "生产企业": "测试企业2"},
+    ]
+    expected = [process_car_info(dict(car), "65") for car in car_infos]
+
+    assert process_car_infos(car_infos, "65") == expected
+    assert process_car_infos([], "65") == []
+
+
 # 测试文档内容提取
 def test_extract_doc_content():
     # 创建模拟的Document对象
@@ -269,6 +300,106 @@ def test_extract_doc_content():
                 assert "关于某些说明" not in info["content"]
 
 
+# 测试带空格的批次标题在完整处理流程中也能识别批次号
+@pytest.mark.parametrize("heading", ["第 65 批", "第 六十五 批"])
+def test_doc_processor_spaced_batch_heading(tmp_path: Path, heading: str):
+    doc = docx.Document()
+    doc.add_paragraph(heading)
+    doc.add_paragraph("一、节能型汽车")
+    doc.add_paragraph("（一）乘用车")
+    table = doc.add_table(rows=2, cols=4)
+    for row, values in zip(
+        table.rows,
+        [["序号", "企业名称", "品牌", "产品型号"], ["1", "甲公司", "甲", "JQ7150"]],
+    ):
+        for cell, value in zip(row.cells, values):
+            cell.text = value
+    doc_path = tmp_path / "spaced.docx"
+    doc.save(str(doc_path))
+
+    processor = DocProcessor(str(doc_path))
+    cars = processor.process()
+
+    assert processor.batch_number == "65"
+    assert [car["batch"] for car in cars] == ["65"]
+
+
+# 测试纯文本预览中多行段落的后续行保持缩进
+def test_format_docx_content_plain_multiline():
+    doc = docx.Document()
+    para = doc.add_paragraph("第六十五批")
+    para.add_run().add_break()
+    para.add_run("补充说明")
+
+    lines = format_docx_content_plain(doc, "test.docx").splitlines()
+
+    assert lines[3] == "  段落 1 (Normal): 🔖 第六十五批"
+    assert lines[4] == "    补充说明"
+
+
+# 测试预览块的分类及表格的空行保留
+def test_iter_docx_preview():
+    doc = docx.Document()
+    doc.add_paragraph("一、节能型汽车")
+    doc.add_paragraph("普通说明")
+    table = doc.add_table(rows=3, cols=2)
+    table.rows[0].cells[0].text = "序号"
+    table.rows[2].cells[0].text = "1"
+
+    blocks = list(iter_docx_preview(doc))
+
+    assert [b.block_type for b in blocks] == [
+        "paragraph",
+        "paragraph",
+        "paragraphs_end",
+        "table",
+        "tables_end",
+    ]
+    assert blocks[0].category == "category"
+    assert blocks[1].category is None
+    assert blocks[3].shape == (3, 2)
+    assert blocks[3].rows == [["序号", ""], ["", ""], ["1", ""]]
+
+
+# 测试段落分类, 上标和带圈数字与isdigit一致视为数字
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("（一）乘用车", "subsection"),
+        ("（一）容积 m³", None),
+        ("（①）补充说明", "note"),
+        ("（1）补充", "numbered_subsection"),
+        ("1.汽油车", "numbered_section"),
+    ],
+)
+def test_paragraph_class_pattern(text: str, expected: str | None):
+    match = PARAGRAPH_CLASS_PATTERN.match(text)
+    assert (match.lastgroup if match else None) == expected
+    preview = PREVIEW_CLASS_PATTERN.match(text)
+    is_subsection = preview is not None and preview.lastgroup == "subsection"
+    assert is_subsection == (expected == "subsection")
+
+
+# 测试批次验证按批次和表格计数
+def test_verify_all_batches():
+    cars = [
+        {"batch": "65", "table_id": 1},
+        {"batch": "65", "table_id": 2},
+        {"batch": "66", "table_id": 1},
+        {"batch": "65", "table_id": 2},
+        {"batch": None, "table_id": 1},
+        {"batch": "", "table_id": 3},
+        {"batch": "67"},
+    ]
+
+    result = verify_all_batches(cars)
+
+    assert list(result) == ["65", "66", "67"]
+    assert result["65"] == {"total": 3, "table_counts": {1: 1, 2: 2}}
+    assert result["66"] == {"total": 1, "table_counts": {1: 1}}
+    assert result["67"] == {"total": 1, "table_counts": {"未知": 1}}
+
+
 # 测试DocProcessor类
 def test_doc_processor():
     # 创建模拟的Document对象